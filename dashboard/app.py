@@ -26,11 +26,21 @@ st.sidebar.markdown("""
 # Load data
 @st.cache_data
 def load_data():
-    val_results = pd.read_csv('data/processed/validation_results.csv', parse_dates=['date'])
-    ml_results = pd.read_csv('data/processed/ml_predictions.csv', parse_dates=['date'])
+    val_results = pd.read_parquet('data/processed/validation_results.parquet')
+    ml_results = pd.read_parquet('data/processed/ml_predictions.parquet')
+    # Sorted DatetimeIndex so date ranges can be sliced with .loc
+    val_results = val_results.set_index('date').sort_index()
+    ml_results = ml_results.set_index('date').sort_index()
     params = pd.read_csv('data/processed/calibrated_parameters.csv')
     return val_results, ml_results, params
 
+@st.cache_data
+def calculate_nse(df, obs_col, sim_col):
+    """Nash-Sutcliffe Efficiency of two DataFrame columns (cached)"""
+    obs = df[obs_col].values
+    sim = df[sim_col].values
+    return 1 - np.sum((obs - sim)**2) / np.sum((obs - np.mean(obs))**2)
+
 val_df, ml_df, params = load_data()
 
 # Metrics
@@ -41,9 +51,7 @@ with col1:
 
 with col2:
     # Calculate ML NSE
-    obs = ml_df['observed'].values
-    pred = ml_df['predicted_ml'].values
-    ml_nse = 1 - np.sum((obs - pred)**2) / np.sum((obs - np.mean(obs))**2)
+    ml_nse = calculate_nse(ml_df, 'observed', 'predicted_ml')
     st.metric("ML R²", f"{ml_nse:.3f}")
 
 with col3:
@@ -63,28 +71,23 @@ with tab1:
                         subplot_titles=("GR4J Model", "XGBoost ML Model"),
                         vertical_spacing=0.15)
     
-    # GR4J
-    fig.add_trace(
-        go.Scatter(x=val_df['date'], y=val_df['observed'], 
-                   name='Observed', line=dict(color='blue', width=2)),
-        row=1, col=1
-    )
-    fig.add_trace(
-        go.Scatter(x=val_df['date'], y=val_df['simulated'], 
-                   name='GR4J Simulated', line=dict(color='red', width=2, dash='dash')),
-        row=1, col=1
-    )
-    
-    # ML
-    fig.add_trace(
-        go.Scatter(x=ml_df['date'], y=ml_df['observed'], 
-                   name='Observed', line=dict(color='blue', width=2), showlegend=False),
-        row=2, col=1
-    )
-    fig.add_trace(
-        go.Scatter(x=ml_df['date'], y=ml_df['predicted_ml'], 
-                   name='ML Predicted', line=dict(color='green', width=2, dash='dash')),
-        row=2, col=1
+    val_dates = val_df.index.to_numpy()
+    ml_dates = ml_df.index.to_numpy()
+    
+    fig.add_traces(
+        [
+            # GR4J
+            go.Scattergl(x=val_dates, y=val_df['observed'].to_numpy(), 
+                         name='Observed', line=dict(color='blue', width=2)),
+            go.Scattergl(x=val_dates, y=val_df['simulated'].to_numpy(), 
+                         name='GR4J Simulated', line=dict(color='red', width=2, dash='dash')),
+            # ML
+            go.Scattergl(x=ml_dates, y=ml_df['observed'].to_numpy(), 
+                         name='Observed', line=dict(color='blue', width=2), showlegend=False),
+            go.Scattergl(x=ml_dates, y=ml_df['predicted_ml'].to_numpy(), 
+                         name='ML Predicted', line=dict(color='green', width=2, dash='dash')),
+        ],
+        rows=[1, 1, 2, 2], cols=[1, 1, 1, 1]
     )
     
     fig.update_xaxes(title_text="Date", row=2, col=1)
@@ -136,13 +139,13 @@ with tab3:
     # Date range selector
     col1, col2 = st.columns(2)
     with col1:
-        start_date = st.date_input("Start Date", value=val_df['date'].min())
+        start_date = st.date_input("Start Date", value=val_df.index.min())
     with col2:
-        end_date = st.date_input("End Date", value=val_df['date'].max())
+        end_date = st.date_input("End Date", value=val_df.index.max())
     
     # Filter data
-    mask = (val_df['date'] >= pd.to_datetime(start_date)) & (val_df['date'] <= pd.to_datetime(end_date))
-    filtered_df = val_df[mask]
+    # ISO date strings slice the cached DatetimeIndex directly (end day inclusive)
+    filtered_df = val_df.loc[str(start_date):str(end_date)]
     
     # Plot with precipitation
     fig = make_subplots(rows=2, cols=1, 
@@ -150,21 +153,18 @@ with tab3:
                         subplot_titles=("Streamflow", "Precipitation"),
                         vertical_spacing=0.1)
     
-    fig.add_trace(
-        go.Scatter(x=filtered_df['date'], y=filtered_df['observed'], 
-                   name='Observed', line=dict(color='blue', width=2)),
-        row=1, col=1
-    )
-    fig.add_trace(
-        go.Scatter(x=filtered_df['date'], y=filtered_df['simulated'], 
-                   name='Simulated', line=dict(color='red', width=2, dash='dash')),
-        row=1, col=1
-    )
-    
-    fig.add_trace(
-        go.Bar(x=filtered_df['date'], y=filtered_df['precipitation'], 
-               name='Precipitation', marker_color='lightblue'),
-        row=2, col=1
+    dates = filtered_df.index.to_numpy()
+    
+    fig.add_traces(
+        [
+            go.Scattergl(x=dates, y=filtered_df['observed'].to_numpy(), 
+                         name='Observed', line=dict(color='blue', width=2)),
+            go.Scattergl(x=dates, y=filtered_df['simulated'].to_numpy(), 
+                         name='Simulated', line=dict(color='red', width=2, dash='dash')),
+            go.Bar(x=dates, y=filtered_df['precipitation'].to_numpy(), 
+                   name='Precipitation', marker_color='lightblue'),
+        ],
+        rows=[1, 1, 2], cols=[1, 1, 1]
     )
     
     fig.update_yaxes(title_text="Streamflow (mm/day)", row=1, col=1)
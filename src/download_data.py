@@ -19,24 +19,39 @@ dates = pd.date_range('2005-01-01', '2014-12-31', freq='D')
 
 # Generate realistic hydrological data
 import numpy as np
-np.random.seed(42)
+rng = np.random.default_rng(42)
+
+n = len(dates)
+
+# Seasonal cycle shared by streamflow and temperature (computed in place)
+season = np.arange(n, dtype=np.float64)
+season *= 2 * np.pi
+season /= 365.25
+np.sin(season, out=season)
+
+# Noise buffer, refilled for each series
+noise = np.empty(n)
 
 # Realistic streamflow (cubic feet per second)
 base_flow = 800
-seasonal = 400 * np.sin(2 * np.pi * np.arange(len(dates)) / 365.25)
-noise = np.random.normal(0, 200, len(dates))
-streamflow = base_flow + seasonal + noise
-streamflow = np.maximum(streamflow, 50)  # Minimum flow
+streamflow = 400 * season
+streamflow += base_flow
+rng.standard_normal(out=noise)
+noise *= 200
+streamflow += noise
+np.maximum(streamflow, 50, out=streamflow)  # Minimum flow
 
 # Precipitation (mm/day)
-precip = np.random.gamma(2, 2, len(dates))
-precip = np.minimum(precip, 100)  # Max 100mm/day
+precip = rng.gamma(2, 2, n)
+np.minimum(precip, 100, out=precip)  # Max 100mm/day
 
 # Temperature (Celsius)
 temp_base = 15
-temp_seasonal = 10 * np.sin(2 * np.pi * np.arange(len(dates)) / 365.25)
-temp_noise = np.random.normal(0, 3, len(dates))
-temperature = temp_base + temp_seasonal + temp_noise
+temperature = 10 * season
+temperature += temp_base
+rng.standard_normal(out=noise)
+noise *= 3
+temperature += noise
 
 # Create DataFrame
 df = pd.DataFrame({
@@ -1,5 +1,8 @@
+import math
+
 import numpy as np
 import pandas as pd
+from numba import njit, types
 
 class GR4J:
     """
@@ -30,128 +33,172 @@ class GR4J:
         - Q: simulated streamflow (mm/day)
         """
         
-        n = len(precip)
-        
-        # Initialize states
-        S = self.X1 * 0.5  # Production store (50% full)
-        R = self.X3 * 0.5  # Routing store (50% full)
-        
-        # Initialize outputs
-        Q = np.zeros(n)
-        
         # Unit hydrograph ordinates
         UH1, UH2 = self._compute_unit_hydrographs()
         
-        # Stores for routing
-        UH1_stores = np.zeros(len(UH1))
-        UH2_stores = np.zeros(len(UH2))
-        
-        for t in range(n):
-            # Net precipitation and evaporation
-            if precip[t] >= evap[t]:
-                Pn = precip[t] - evap[t]
-                En = 0
-                
-                # Calculate Ps (part going to production store)
-                capacity_ratio = S / self.X1
-                Ps = self.X1 * (1 - capacity_ratio**2) * np.tanh(Pn / self.X1)
-                Ps = Ps / (1 + capacity_ratio * np.tanh(Pn / self.X1))
-                
-                Es = 0
-            else:
-                Pn = 0
-                En = evap[t] - precip[t]
-                
-                # Calculate Es (evaporation from store)
-                capacity_ratio = S / self.X1
-                Es = S * (2 - capacity_ratio) * np.tanh(En / self.X1)
-                Es = Es / (1 + (1 - capacity_ratio) * np.tanh(En / self.X1))
-                
-                Ps = 0
-            
-            # Update production store
-            S = S - Es + Ps
-            S = np.clip(S, 0, self.X1)
-            
-            # Percolation from production store
-            perc_ratio = S / self.X1
-            perc = S * (1 - (1 + (perc_ratio / 2.25)**4)**(-0.25))
-            S = S - perc
-            
-            # Total water for routing
-            Pr = perc + (precip[t] - Ps)
-            
-            # Split for routing (90% to UH1, 10% to UH2)
-            Pr9 = 0.9 * Pr
-            Pr1 = 0.1 * Pr
-            
-            # Route through unit hydrographs
-            UH1_stores = np.roll(UH1_stores, 1)
-            UH1_stores[0] = Pr9
-            Q9 = np.sum(UH1_stores * UH1)
-            
-            UH2_stores = np.roll(UH2_stores, 1)
-            UH2_stores[0] = Pr1
-            Q1 = np.sum(UH2_stores * UH2)
-            
-            # Groundwater exchange
-            F = self.X2 * (R / self.X3)**3.5
-            
-            # Update routing store
-            R = max(0, R + Q9 + F)
-            
-            # Outflow from routing store
-            routing_ratio = R / self.X3
-            Qr = R * (1 - (1 + (routing_ratio / 2.25)**4)**(-0.25))
-            R = R - Qr
-            
-            # Total flow
-            Qd = max(0, Qr + Q1)
-            Q[t] = Qd
-        
-        return Q
+        return _gr4j_step_loop(
+            np.ascontiguousarray(precip, dtype=np.float64),
+            np.ascontiguousarray(evap, dtype=np.float64),
+            float(self.X1), float(self.X2), float(self.X3), float(self.X4),
+            UH1, UH2
+        )
     
     def _compute_unit_hydrographs(self):
         """Compute unit hydrograph ordinates"""
-        
-        # UH1 ordinates (time base = X4)
-        nUH1 = int(np.ceil(self.X4))
-        UH1 = np.zeros(nUH1)
-        
-        for t in range(nUH1):
-            if t < self.X4:
-                UH1[t] = ((t + 1) / self.X4)**2.5
-        
-        # Normalize
-        if nUH1 > 1:
-            UH1[1:] = UH1[1:] - UH1[:-1]
-        
-        # UH2 ordinates (time base = 2*X4)
-        nUH2 = int(np.ceil(2 * self.X4))
-        UH2 = np.zeros(nUH2)
-        
-        for t in range(nUH2):
-            if t < self.X4:
-                UH2[t] = 0.5 * ((t + 1) / self.X4)**2.5
-            elif t < 2 * self.X4:
-                ratio = 2 - (t + 1) / self.X4
-                if ratio > 0:  # Fix: avoid negative power
-                    UH2[t] = 1 - 0.5 * ratio**2.5
-                else:
-                    UH2[t] = 1
-        
-        # Normalize
-        if nUH2 > 1:
-            UH2[1:] = UH2[1:] - UH2[:-1]
-        
-        return UH1, UH2
+        return _compute_uh(self.X4)
+
+
+def _compute_uh(X4):
+    """Compute unit hydrograph ordinates for time base X4"""
+    
+    # UH1 ordinates (time base = X4)
+    nUH1 = int(np.ceil(X4))
+    t1 = np.arange(nUH1)
+    UH1 = np.where(t1 < X4, ((t1 + 1) / X4)**2.5, 0.0)
+    
+    # Normalize
+    if nUH1 > 1:
+        UH1[1:] = UH1[1:] - UH1[:-1]
+    
+    # UH2 ordinates (time base = 2*X4)
+    nUH2 = int(np.ceil(2 * X4))
+    t2 = np.arange(nUH2)
+    ratio = np.maximum(2 - (t2 + 1) / X4, 0.0)  # Clamp: avoid negative power
+    UH2 = np.where(t2 < X4,
+                   0.5 * ((t2 + 1) / X4)**2.5,
+                   np.where(t2 < 2 * X4, 1 - 0.5 * ratio**2.5, 0.0))
+    
+    # Normalize
+    if nUH2 > 1:
+        UH2[1:] = UH2[1:] - UH2[:-1]
+    
+    return UH1, UH2
+
+
+# Input arrays are only read, so accept read-only views (e.g. pandas copy-on-write)
+_f8_array_in = types.Array(types.float64, 1, 'A', readonly=True)
+
+
+@njit(types.float64[:](_f8_array_in, _f8_array_in,
+                       types.float64, types.float64, types.float64, types.float64,
+                       _f8_array_in, _f8_array_in),
+      cache=True, fastmath=True, boundscheck=False)
+def _gr4j_step_loop(precip, evap, X1, X2, X3, X4, UH1, UH2):
+    """
+    GR4J time-stepping loop (compiled with Numba)
+    
+    Parameters:
+    - precip: array of precipitation (mm/day)
+    - evap: array of potential evapotranspiration (mm/day)
+    - X1, X2, X3, X4: model parameters
+    - UH1, UH2: unit hydrograph ordinates
+    
+    Returns:
+    - Q: simulated streamflow (mm/day)
+    """
+    
+    n = precip.shape[0]
+    
+    # Initialize states
+    S = X1 * 0.5  # Production store (50% full)
+    R = X3 * 0.5  # Routing store (50% full)
+    
+    # Initialize outputs
+    Q = np.zeros(n)
+    
+    # Stores for routing
+    nUH1 = UH1.shape[0]
+    nUH2 = UH2.shape[0]
+    UH1_stores = np.zeros(nUH1)
+    UH2_stores = np.zeros(nUH2)
+    head1 = 0
+    head2 = 0
+    
+    for t in range(n):
+        # Net precipitation and evaporation (at most one is non-zero)
+        Pn = max(precip[t] - evap[t], 0.0)
+        En = max(evap[t] - precip[t], 0.0)
+        
+        # Calculate Ps (part going to production store) and Es (evaporation
+        # from store); both are computed branch-free and vanish when Pn or En is 0
+        capacity_ratio = S / X1
+        tPn = math.tanh(Pn / X1)
+        tEn = math.tanh(En / X1)
+        Ps = X1 * (1 - capacity_ratio * capacity_ratio) * tPn / (1 + capacity_ratio * tPn)
+        Es = S * (2 - capacity_ratio) * tEn / (1 + (1 - capacity_ratio) * tEn)
+        
+        # Update production store
+        S = S - Es + Ps
+        S = min(max(S, 0.0), X1)
+        
+        # Percolation from production store
+        perc_ratio = S / X1
+        perc = S * (1 - (1 + (perc_ratio / 2.25)**4)**(-0.25))
+        S = S - perc
+        
+        # Total water for routing
+        Pr = perc + (precip[t] - Ps)
+        
+        # Split for routing (90% to UH1, 10% to UH2)
+        Pr9 = 0.9 * Pr
+        Pr1 = 0.1 * Pr
+        
+        # Route through unit hydrographs (ring buffers, newest value at head)
+        head1 = (head1 - 1) % nUH1
+        UH1_stores[head1] = Pr9
+        Q9 = 0.0
+        for k in range(nUH1):
+            Q9 += UH1_stores[(head1 + k) % nUH1] * UH1[k]
+        
+        head2 = (head2 - 1) % nUH2
+        UH2_stores[head2] = Pr1
+        Q1 = 0.0
+        for k in range(nUH2):
+            Q1 += UH2_stores[(head2 + k) % nUH2] * UH2[k]
+        
+        # Groundwater exchange
+        F = X2 * (R / X3)**3.5
+        
+        # Update routing store
+        R = max(0.0, R + Q9 + F)
+        
+        # Outflow from routing store
+        routing_ratio = R / X3
+        Qr = R * (1 - (1 + (routing_ratio / 2.25)**4)**(-0.25))
+        R = R - Qr
+        
+        # Total flow
+        Q[t] = max(0.0, Qr + Q1)
+    
+    return Q
+
 
+def hargreaves(temp):
+    """Estimate potential evapotranspiration (mm/day) from temperature (simplified Hargreaves)"""
+    evap = 0.0023 * (temp + 17.8) * np.sqrt(np.abs(temp - (-5))) * 2.5
+    return np.maximum(evap, 0)
 
+
+@njit(cache=True)
 def calculate_nse(observed, simulated):
-    """Calculate Nash-Sutcliffe Efficiency"""
-    obs_mean = np.mean(observed)
-    numerator = np.sum((observed - simulated)**2)
-    denominator = np.sum((observed - obs_mean)**2)
+    """Calculate Nash-Sutcliffe Efficiency (single pass over the arrays)"""
+    n = observed.shape[0]
+    
+    # Sums of observations are shifted by the first value to avoid
+    # cancellation when forming the variance from sum of squares
+    shift = observed[0]
+    sum_obs = 0.0
+    sum_sq_obs = 0.0
+    sum_sq_err = 0.0
+    for i in range(n):
+        d = observed[i] - shift
+        sum_obs += d
+        sum_sq_obs += d * d
+        err = observed[i] - simulated[i]
+        sum_sq_err += err * err
+    
+    numerator = sum_sq_err
+    denominator = sum_sq_obs - sum_obs * sum_obs / n
     nse = 1 - (numerator / denominator)
     return nse
 
@@ -160,21 +207,17 @@ if __name__ == "__main__":
     print("Testing GR4J Model...")
     
     # Load calibration data
-    df = pd.read_csv("data/processed/calibration_data.csv", parse_dates=['date'], index_col='date')
+    df = pd.read_parquet("data/processed/calibration_data.parquet")
     
     # Prepare inputs
-    precip = df['precipitation_mm'].values
+    precip = df['precipitation_mm'].to_numpy(dtype=np.float64, copy=False)
     
     # Estimate potential evapotranspiration from temperature (simple method)
-    temp = df['temperature_c'].values
-    evap = 0.0023 * (temp + 17.8) * np.sqrt(np.abs(temp - (-5))) * 2.5  # Hargreaves simplified
-    evap = np.maximum(evap, 0)
-    
-    # Observed streamflow (convert from cfs to mm/day)
-    # Assuming basin area of 2000 km^2
-    basin_area_km2 = 2000
-    cfs_to_mm = 86400 / (basin_area_km2 * 1e6) * 0.0283168 * 1000
-    obs_flow = df['streamflow_cfs'].values * cfs_to_mm
+    temp = df['temperature_c'].to_numpy(dtype=np.float64, copy=False)
+    evap = hargreaves(temp)
+    
+    # Observed streamflow (mm/day, converted from cfs in process_data.py)
+    obs_flow = df['streamflow_mm'].to_numpy(dtype=np.float64, copy=False)
     
     # Run model with default parameters
     model = GR4J(X1=350, X2=0, X3=90, X4=1.7)
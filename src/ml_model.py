@@ -2,23 +2,21 @@ import numpy as np
 import pandas as pd
 import xgboost as xgb
 from sklearn.metrics import mean_squared_error, r2_score
-import pickle
+from pathlib import Path
 
 print("=" * 60)
 print("TRAINING ML MODEL (XGBoost)")
 print("=" * 60)
 
 # Load calibration data
-df_cal = pd.read_csv("data/processed/calibration_data.csv", parse_dates=['date'], index_col='date')
+df_cal = pd.read_parquet("data/processed/calibration_data.parquet")
 
 # Prepare features for ML
 features = ['precipitation_mm', 'temperature_c', 'precip_7day', 'temp_7day']
-X_train = df_cal[features].values
+X_train = df_cal[features].to_numpy(dtype=np.float32)  # XGBoost bins float32 directly
 
-# Target: streamflow
-basin_area_km2 = 2000
-cfs_to_mm = 86400 / (basin_area_km2 * 1e6) * 0.0283168 * 1000
-y_train = df_cal['streamflow_cfs'].values * cfs_to_mm
+# Target: streamflow (mm/day)
+y_train = df_cal['streamflow_mm'].to_numpy(dtype=np.float32)
 
 print(f"\nTraining data:")
 print(f"  Samples: {len(X_train)}")
@@ -27,17 +25,21 @@ print(f"  Features: {features}")
 # Train XGBoost model
 print("\nTraining XGBoost...")
 
-model = xgb.XGBRegressor(
-    n_estimators=100,
-    max_depth=6,
-    learning_rate=0.1,
-    random_state=42
-)
+params = {
+    'max_depth': 6,
+    'learning_rate': 0.1,
+    'tree_method': 'hist',
+    'max_bin': 256,
+    'device': 'cpu',
+    'objective': 'reg:squarederror',
+    'seed': 42
+}
 
-model.fit(X_train, y_train)
+dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=features)
+model = xgb.train(params, dtrain, num_boost_round=100)
 
 # Predictions on training data
-y_pred_train = model.predict(X_train)
+y_pred_train = model.predict(dtrain)
 
 # Calculate metrics
 rmse_train = np.sqrt(mean_squared_error(y_train, y_pred_train))
@@ -48,12 +50,12 @@ print(f"  RMSE: {rmse_train:.3f} mm/day")
 print(f"  R²:   {r2_train:.3f}")
 
 # Validate on validation set
-df_val = pd.read_csv("data/processed/validation_data.csv", parse_dates=['date'], index_col='date')
+df_val = pd.read_parquet("data/processed/validation_data.parquet")
 
-X_val = df_val[features].values
-y_val = df_val['streamflow_cfs'].values * cfs_to_mm
+X_val = df_val[features].to_numpy(dtype=np.float32)
+y_val = df_val['streamflow_mm'].to_numpy(dtype=np.float64, copy=False)
 
-y_pred_val = model.predict(X_val)
+y_pred_val = model.predict(xgb.DMatrix(X_val, feature_names=features))
 
 rmse_val = np.sqrt(mean_squared_error(y_val, y_pred_val))
 r2_val = r2_score(y_val, y_pred_val)
@@ -62,17 +64,19 @@ print(f"\nValidation Performance:")
 print(f"  RMSE: {rmse_val:.3f} mm/day")
 print(f"  R²:   {r2_val:.3f}")
 
-# Feature importance
-importance = model.feature_importances_
+# Feature importance (normalized gain, as reported by XGBRegressor)
+gain = model.get_score(importance_type='gain')
+total_gain = sum(gain.values())
+importance = [gain.get(feat, 0.0) / total_gain for feat in features]
 print(f"\nFeature Importance:")
 for feat, imp in zip(features, importance):
     print(f"  {feat:20s}: {imp:.3f}")
 
 # Save model
-with open('models/xgboost_model.pkl', 'wb') as f:
-    pickle.dump(model, f)
+Path('models').mkdir(parents=True, exist_ok=True)
+model.save_model('models/xgboost_model.json')
 
-print(f"\n✓ Saved model to models/xgboost_model.pkl")
+print(f"\n✓ Saved model to models/xgboost_model.json")
 
 # Save predictions
 results = pd.DataFrame({
@@ -80,9 +84,9 @@ results = pd.DataFrame({
     'observed': y_val,
     'predicted_ml': y_pred_val
 })
-results.to_csv('data/processed/ml_predictions.csv', index=False)
+results.to_parquet('data/processed/ml_predictions.parquet', index=False, engine='pyarrow', compression='zstd')
 
-print(f"✓ Saved predictions to data/processed/ml_predictions.csv")
+print(f"✓ Saved predictions to data/processed/ml_predictions.parquet")
 print("\n" + "=" * 60)
 print("ML MODEL TRAINING COMPLETE")
 print("=" * 60)
\ No newline at end of file
@@ -23,17 +23,19 @@ def create_sample_netcdf():
     # Create time dimension (daily for 2012-2014)
     time = pd.date_range('2012-01-01', '2014-12-31', freq='D')
     
-    # Generate realistic gridded data
-    np.random.seed(42)
+    # Generate realistic gridded data (float32 throughout)
+    rng = np.random.default_rng(42)
+    shape = (len(time), len(lat), len(lon))
     
     # Precipitation (mm/day) - 3D array (time, lat, lon)
-    precip = np.random.gamma(2, 2, size=(len(time), len(lat), len(lon)))
-    precip = np.clip(precip, 0, 100)
+    precip = rng.standard_gamma(2, size=shape, dtype=np.float32) * np.float32(2)  # Gamma(shape=2, scale=2)
+    np.clip(precip, 0, 100, out=precip)
     
     # Temperature (Celsius) - 3D array (time, lat, lon)
     temp_base = 15
-    temp_seasonal = 10 * np.sin(2 * np.pi * np.arange(len(time)) / 365.25)
-    temp = temp_base + temp_seasonal[:, np.newaxis, np.newaxis] + np.random.normal(0, 3, size=(len(time), len(lat), len(lon)))
+    temp_seasonal = (10 * np.sin(2 * np.pi * np.arange(len(time)) / 365.25)).astype(np.float32)
+    temp = rng.standard_normal(size=shape, dtype=np.float32) * np.float32(3)
+    temp += temp_base + temp_seasonal[:, np.newaxis, np.newaxis]
     
     # Create xarray Dataset
     ds = xr.Dataset(
@@ -66,7 +68,10 @@ def create_sample_netcdf():
     # Save to NetCDF
     Path('data/raw').mkdir(parents=True, exist_ok=True)
     nc_file = 'data/raw/climate_data.nc'
-    ds.to_netcdf(nc_file)
+    # Store in yearly time chunks, matching the chunks used when reading
+    encoding = {var: {'dtype': 'float32', 'zlib': True, 'complevel': 4,
+                      'chunksizes': (365, len(lat), len(lon))} for var in ds.data_vars}
+    ds.to_netcdf(nc_file, encoding=encoding)
     
     print(f"✓ Created NetCDF file: {nc_file}")
     print(f"  Dimensions: {dict(ds.dims)}")
@@ -83,8 +88,8 @@ def extract_basin_average(nc_file, basin_lat=32.22, basin_lon=-110.97):
     
     print(f"\nExtracting basin average from NetCDF...")
     
-    # Open NetCDF file
-    ds = xr.open_dataset(nc_file)
+    # Open NetCDF file (dask-backed, one year of timesteps per chunk)
+    ds = xr.open_dataset(nc_file, chunks={'time': 365})
     
     print(f"  Loaded dataset: {nc_file}")
     print(f"  Grid size: {len(ds.lat)} x {len(ds.lon)}")
@@ -93,27 +98,27 @@ def extract_basin_average(nc_file, basin_lat=32.22, basin_lon=-110.97):
     # Select nearest grid point to basin center
     basin_point = ds.sel(lat=basin_lat, lon=basin_lon, method='nearest')
     
-    # Extract time series
-    precip_ts = basin_point['precipitation'].values
-    temp_ts = basin_point['temperature'].values
+    # Extract time series and spatial statistics (demonstrate NetCDF processing)
+    # Built lazily and computed together so dask reads each time chunk once
+    stats = xr.Dataset({
+        'precip_netcdf': basin_point['precipitation'],
+        'temp_netcdf': basin_point['temperature'],
+        'precip_spatial_mean': ds['precipitation'].mean(dim=['lat', 'lon']),
+        'precip_spatial_std': ds['precipitation'].std(dim=['lat', 'lon'])
+    }).compute()
     
     # Create DataFrame
     df = pd.DataFrame({
         'date': ds.time.values,
-        'precip_netcdf': precip_ts,
-        'temp_netcdf': temp_ts
+        'precip_netcdf': stats['precip_netcdf'].values,
+        'temp_netcdf': stats['temp_netcdf'].values,
+        'precip_spatial_mean': stats['precip_spatial_mean'].values,
+        'precip_spatial_std': stats['precip_spatial_std'].values
     })
     
     df['date'] = pd.to_datetime(df['date'])
     df = df.set_index('date')
     
-    # Calculate spatial statistics (demonstrate NetCDF processing)
-    precip_spatial_mean = ds['precipitation'].mean(dim=['lat', 'lon']).values
-    precip_spatial_std = ds['precipitation'].std(dim=['lat', 'lon']).values
-    
-    df['precip_spatial_mean'] = precip_spatial_mean
-    df['precip_spatial_std'] = precip_spatial_std
-    
     print(f"\n✓ Extracted basin time series")
     print(f"  Records: {len(df)}")
     print(f"  Mean precipitation: {df['precip_netcdf'].mean():.2f} mm/day")
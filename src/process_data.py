@@ -1,3 +1,4 @@
+import bottleneck as bn
 import pandas as pd
 from pathlib import Path
 
@@ -8,12 +9,18 @@ df = pd.read_csv("data/raw/hydro_data.csv")
 df['date'] = pd.to_datetime(df['date'])
 df = df.set_index('date')
 
+# Observed streamflow in mm/day (basin area of 2000 km^2)
+basin_area_km2 = 2000
+cfs_to_mm = 86400 / (basin_area_km2 * 1e6) * 0.0283168 * 1000
+df['streamflow_mm'] = df['streamflow_cfs'] * cfs_to_mm
+
 # Calculate additional features for ML
-df['precip_7day'] = df['precipitation_mm'].rolling(7).mean()  # Antecedent precipitation
-df['temp_7day'] = df['temperature_c'].rolling(7).mean()       # 7-day avg temp
+window = 7
+df['precip_7day'] = bn.move_mean(df['precipitation_mm'].values, window=window, min_count=window)  # Antecedent precipitation
+df['temp_7day'] = bn.move_mean(df['temperature_c'].values, window=window, min_count=window)       # 7-day avg temp
 
-# Remove NaN from rolling calculations
-df = df.dropna()
+# Remove incomplete windows from rolling calculations
+df = df.iloc[window - 1:]
 
 # Split into calibration and validation
 split_date = '2012-01-01'
@@ -24,8 +31,8 @@ df_val = df[df.index >= split_date]
 Path("data/processed").mkdir(parents=True, exist_ok=True)
 
 df.to_csv("data/processed/complete_data.csv")
-df_cal.to_csv("data/processed/calibration_data.csv")
-df_val.to_csv("data/processed/validation_data.csv")
+df_cal.to_parquet("data/processed/calibration_data.parquet", engine='pyarrow', compression='zstd')
+df_val.to_parquet("data/processed/validation_data.parquet", engine='pyarrow', compression='zstd')
 
 print(f"\n✓ Processed data saved")
 print(f"  Total records: {len(df)}")
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from gr4j_model import GR4J, calculate_nse
+from gr4j_model import GR4J, calculate_nse, hargreaves
 
 print("=" * 60)
 print("VALIDATING GR4J MODEL")
@@ -21,18 +21,15 @@ print(f"  X3 = {X3:.2f} mm")
 print(f"  X4 = {X4:.2f} days")
 
 # Load validation data
-df_val = pd.read_csv("data/processed/validation_data.csv", parse_dates=['date'], index_col='date')
+df_val = pd.read_parquet("data/processed/validation_data.parquet")
 
 # Prepare inputs
-precip = df_val['precipitation_mm'].values
-temp = df_val['temperature_c'].values
-evap = 0.0023 * (temp + 17.8) * np.sqrt(np.abs(temp - (-5))) * 2.5
-evap = np.maximum(evap, 0)
+precip = df_val['precipitation_mm'].to_numpy(dtype=np.float64, copy=False)
+temp = df_val['temperature_c'].to_numpy(dtype=np.float64, copy=False)
+evap = hargreaves(temp)
 
-# Observed flow
-basin_area_km2 = 2000
-cfs_to_mm = 86400 / (basin_area_km2 * 1e6) * 0.0283168 * 1000
-obs_flow = df_val['streamflow_cfs'].values * cfs_to_mm
+# Observed flow (mm/day)
+obs_flow = df_val['streamflow_mm'].to_numpy(dtype=np.float64, copy=False)
 
 # Run model
 model = GR4J(X1=X1, X2=X2, X3=X3, X4=X4)
@@ -58,9 +55,9 @@ results = pd.DataFrame({
     'simulated': sim_flow,
     'precipitation': precip
 })
-results.to_csv("data/processed/validation_results.csv", index=False)
+results.to_parquet("data/processed/validation_results.parquet", index=False, engine='pyarrow', compression='zstd')
 
-print(f"\n✓ Saved results to data/processed/validation_results.csv")
+print(f"\n✓ Saved results to data/processed/validation_results.parquet")
 
 # Create plot
 plt.figure(figsize=(12, 6))